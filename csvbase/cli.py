@@ -162,15 +162,16 @@ def repcache_populate(ref: str) -> None:
                 with repcache.open(
                     table.table_uuid, content_type, table.last_changed, mode="wb"
                 ) as rep_file:
-                    columns = backend.get_columns(table.table_uuid)
-                    rows = backend.table_as_rows(table.table_uuid)
-                    if content_type is ContentType.PARQUET:
-                        table_io.rows_to_parquet(columns, rows, rep_file)
-                    elif content_type is ContentType.JSON_LINES:
-                        table_io.rows_to_jsonlines(columns, rows, rep_file)
-                    elif content_type is ContentType.XLSX:
-                        table_io.rows_to_xlsx(
-                            columns, rows, excel_table=False, buf=rep_file
-                        )
+                    if content_type is ContentType.CSV:
+                        backend.table_as_csv(table.table_uuid, buf=rep_file)
                     else:
-                        table_io.rows_to_csv(columns, rows, buf=rep_file)
+                        columns = backend.get_columns(table.table_uuid)
+                        rows = backend.table_as_rows(table.table_uuid)
+                        if content_type is ContentType.PARQUET:
+                            table_io.rows_to_parquet(columns, rows, rep_file)
+                        elif content_type is ContentType.JSON_LINES:
+                            table_io.rows_to_jsonlines(columns, rows, rep_file)
+                        else:
+                            table_io.rows_to_xlsx(
+                                columns, rows, excel_table=False, buf=rep_file
+                            )
@@ -23,7 +23,7 @@ from sqlalchemy.sql.expression import table as satable
 from sqlalchemy.dialects.postgresql import insert as pginsert
 import importlib_resources
 
-from . import exc, models, table_io
+from . import exc, models
 from .userdata import PGUserdataAdapter
 from .value_objs import (
     Column,
@@ -303,9 +303,7 @@ def update_upstream(sesh: Session, table: Table) -> None:
     if upstream is not None:
         gua = GitSource()
         backend = PGUserdataAdapter(sesh)
-        columns = backend.get_columns(table.table_uuid)
-        rows = backend.table_as_rows(table.table_uuid)
-        buf = table_io.rows_to_csv(columns, rows)
+        buf = backend.table_as_csv(table.table_uuid)
         gua.update(upstream.repo_url, upstream.branch, upstream.path, buf)
         logger.info("updated '%s'", upstream.repo_url)
 
@@ -708,6 +706,8 @@ RETURNING
     username;
     """
     )
+    # ON CONFLICT so that concurrent loads (eg parallel test workers) don't
+    # race each other into unique violations
     add_stmt = text(
         """
 INSERT INTO metadata.prohibited_usernames (username)
@@ -720,6 +720,8 @@ SELECT
     username
 FROM
     metadata.prohibited_usernames
+ON CONFLICT
+    DO NOTHING
 RETURNING
     username;
     """
@@ -1,4 +1,4 @@
-from typing import Protocol, Iterable, List, Sequence, Tuple, Optional
+from typing import IO, Protocol, Iterable, List, Sequence, Tuple, Optional
 from uuid import UUID
 
 from ..value_objs import Column, Table, PythonType, KeySet, Page
@@ -24,3 +24,7 @@ class UserdataAdapter(Protocol):
     def get_columns(self, table_uuid: UUID) -> List[Column]: ...
 
     def table_as_rows(self, table_uuid: UUID) -> Iterable[Sequence[PythonType]]: ...
+
+    def table_as_csv(
+        self, table_uuid: UUID, buf: Optional[IO[bytes]] = None
+    ) -> IO[bytes]: ...
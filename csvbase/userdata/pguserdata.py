@@ -1,14 +1,25 @@
+import csv
+import io
+import os
+import struct
+from logging import getLogger
 from typing import (
+    IO,
     TYPE_CHECKING,
+    Callable,
     Iterable,
     List,
+    Mapping,
     Optional,
     Sequence,
     Tuple,
+    Type,
 )
-from uuid import UUID, uuid4
+from datetime import date
+from uuid import UUID
 
-from pgcopy import CopyManager
+import psycopg2
+from psycopg2 import sql as pgsql
 from sqlalchemy import (
     column as sacolumn,
     func,
@@ -31,6 +42,8 @@ from sqlalchemy.sql.expression import (
 )
 from sqlalchemy.ext.compiler import compiles
 
+from .. import table_io
+from ..streams import UserSubmittedCSVData, rewind
 from ..value_objs import (
     RowCount,
     Column,
@@ -46,6 +59,59 @@ from ..value_objs import (
 if TYPE_CHECKING:
     from sqlalchemy.engine import RowProxy
 
+logger = getLogger(__name__)
+
+# How many rows to COPY at a time.  Bounds peak memory use when loading very
+# large files - diminishing returns beyond the low tens of thousands.
+COPY_BATCH_SIZE = 10_000
+
+# Column types for which Postgres's csv parsing matches our own converters
+# (csvbase.conv).  For the other types Postgres is *looser* than us in ways
+# the python fallback can't catch (it only fires when Postgres errors):
+# 'nan' would load as an actual NaN rather than NULL (it's in
+# conv.NULL_STRINGS), '1' would load as a boolean and '1/2/2003' as a
+# DateStyle-dependent date, where our converters raise.  Csv files with such
+# columns are parsed in Python.
+COPYABLE_COLUMN_TYPES = frozenset([ColumnType.TEXT, ColumnType.INTEGER])
+
+# The COPY binary format: an 11 byte signature, then int32 flags and int32
+# header extension length (both zero).  Each row is an int16 field count
+# followed by [int32 length][data] per field (length -1 for null), and the
+# whole stream ends with an int16 -1.
+# https://www.postgresql.org/docs/current/sql-copy.html#id-1.9.3.55.9.4
+BINARY_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+BINARY_COPY_TRAILER = struct.pack(">h", -1)
+BINARY_COPY_NULL = struct.pack(">i", -1)
+
+_INT8_STRUCT = struct.Struct(">iq")
+_INT4_STRUCT = struct.Struct(">ii")
+_FLOAT8_STRUCT = struct.Struct(">id")
+_BOOL_STRUCT = struct.Struct(">i?")
+_DATE_STRUCT = struct.Struct(">ii")
+
+# days between the postgres epoch (2000-01-01) and the "proleptic Gregorian
+# ordinal" epoch used by date.toordinal
+_PG_EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+
+
+def _pack_text(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    return struct.pack(">i", len(encoded)) + encoded
+
+
+# Prebuilt packers for writing values in COPY's binary format without any
+# per-cell type dispatch.  Keyed on the SQL type of the target column rather
+# than ColumnType: the binary format requires exact field widths and
+# ColumnType.INTEGER covers both "integer" and "bigint".
+BINARY_COPY_PACKERS: Mapping[str, Callable[..., bytes]] = {
+    "text": _pack_text,
+    "bigint": lambda value: _INT8_STRUCT.pack(8, value),
+    "integer": lambda value: _INT4_STRUCT.pack(4, value),
+    "double precision": lambda value: _FLOAT8_STRUCT.pack(8, value),
+    "boolean": lambda value: _BOOL_STRUCT.pack(1, value),
+    "date": lambda value: _DATE_STRUCT.pack(4, value.toordinal() - _PG_EPOCH_ORDINAL),
+}
+
 
 class PGUserdataAdapter:
     def __init__(self, sesh: Session) -> None:
@@ -55,7 +121,8 @@ class PGUserdataAdapter:
     def _make_temp_table_name(self, prefix: str) -> str:
         # FIXME: this name should probably include the date and some other helpful
         # info for debugging
-        return f"{prefix}_{uuid4().hex}"
+        # 8 random bytes is plenty - and keeps well within NAMEDATALEN (63)
+        return f"{prefix}_{os.urandom(8).hex()}"
 
     # NOTE: Could be a function
     def _get_tableclause(
@@ -68,9 +135,17 @@ class PGUserdataAdapter:
         )
 
     def _get_userdata_tableclause(self, table_uuid: UUID) -> TableClause:
-        columns = self.get_columns(table_uuid)
-        table_name = self._make_userdata_table_name(table_uuid)
-        return self._get_tableclause(table_name, columns, schema="userdata")
+        # TableClauses are immutable so, like the columns they are built
+        # from, they are cached on the session rather than rebuilt for each
+        # of the several calls per request.
+        tableclause_cache = self.sesh.info.setdefault("tableclause_cache", {})
+        if table_uuid not in tableclause_cache:
+            columns = self.get_columns(table_uuid)
+            table_name = self._make_userdata_table_name(table_uuid)
+            tableclause_cache[table_uuid] = self._get_tableclause(
+                table_name, columns, schema="userdata"
+            )
+        return tableclause_cache[table_uuid]
 
     # NOTE: Could be a function
     def _make_userdata_table_name(self, table_uuid: UUID, with_schema=False) -> str:
@@ -85,9 +160,12 @@ class PGUserdataAdapter:
         This should be done after inserts that raise the csvbase_row_id.
 
         """
+        self.sesh.execute(self._reset_pk_sequence_stmt(tableclause))
+
+    def _reset_pk_sequence_stmt(self, tableclause: TableClause) -> Executable:
         fullname = tableclause.fullname  # type: ignore
 
-        stmt = select(
+        return select(
             func.setval(
                 func.pg_get_serial_sequence(fullname, "csvbase_row_id"),
                 func.greatest(
@@ -104,7 +182,6 @@ class PGUserdataAdapter:
                 ),
             )
         )
-        self.sesh.execute(stmt)
 
     def count(self, table_uuid: UUID) -> RowCount:
         """Count the rows."""
@@ -114,26 +191,89 @@ class PGUserdataAdapter:
         return RowCount(exact, approx)
 
     def get_columns(self, table_uuid: UUID) -> List["Column"]:
-        # lifted from https://dba.stackexchange.com/a/22420/28877
-        attrelid = self._make_userdata_table_name(table_uuid, with_schema=True)
+        # Almost every adapter method needs the columns, so they are cached on
+        # the session to avoid re-querying pg_attribute several times per
+        # request.  DDL (create_table/drop_table) invalidates.
+        column_cache = self.sesh.info.setdefault("column_cache", {})
+        if table_uuid not in column_cache:
+            attrelid = self._make_userdata_table_name(table_uuid, with_schema=True)
+            column_cache[table_uuid] = [
+                Column(name=name, type_=ColumnType.from_sql_type(sql_type))
+                for name, sql_type in self._get_sql_column_types(attrelid)
+            ]
+        return column_cache[table_uuid]
+
+    def _get_sql_column_types(self, attrelid: str) -> List[Tuple[str, str]]:
+        """Column names and their SQL types, in attnum order."""
+        # lifted from https://dba.stackexchange.com/a/22420/28877, then
+        # aggregated into a single json row so that wide tables don't pay
+        # per-column row marshaling (psycopg2 parses the json for us)
         stmt = text(
             """
-        SELECT attname AS column_name, atttypid::regtype AS sql_type
+        SELECT json_agg(
+            json_build_object('name', attname, 'type', atttypid::regtype::text)
+            ORDER BY attnum
+        )
         FROM   pg_attribute
         WHERE  attrelid = :table_name ::regclass
         AND    attnum > 0
         AND    NOT attisdropped
-        ORDER  BY attnum
         """
         )
-        rs = self.sesh.execute(stmt, {"table_name": attrelid})
-        rv = []
-        for name, sql_type in rs:
-            rv.append(Column(name=name, type_=ColumnType.from_sql_type(sql_type)))
-        return rv
+        agg = self.sesh.execute(stmt, {"table_name": attrelid}).scalar()
+        return [(c["name"], c["type"]) for c in agg]
 
-    def get_row(self, table_uuid: UUID, row_id: int) -> Optional[Row]:
-        columns = self.get_columns(table_uuid)
+    def _copy_in_binary(
+        self,
+        temp_table_name: str,
+        columns: Sequence[Column],
+        rows: Iterable[Sequence[PythonType]],
+    ) -> None:
+        """COPY rows into a temp table using the binary format.
+
+        The per-column packers are picked up-front from the temp table's
+        actual SQL types (which it inherited from the target table), so there
+        is no type introspection or dispatch in the per-cell loop.
+
+        """
+        sql_types = dict(self._get_sql_column_types(temp_table_name))
+        packers = [BINARY_COPY_PACKERS[sql_types[c.name]] for c in columns]
+        field_count = struct.pack(">h", len(columns))
+        copy_stmt = pgsql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT BINARY)").format(
+            pgsql.Identifier(temp_table_name),
+            pgsql.SQL(", ").join(pgsql.Identifier(c.name) for c in columns),
+        )
+        raw_conn = self.sesh.connection().connection
+        with raw_conn.cursor() as cursor:
+            for batch in table_io.batched(rows, COPY_BATCH_SIZE):
+                buf = io.BytesIO()
+                buf.write(BINARY_COPY_HEADER)
+                for row in batch:
+                    buf.write(field_count)
+                    for packer, value in zip(packers, row):
+                        buf.write(BINARY_COPY_NULL if value is None else packer(value))
+                buf.write(BINARY_COPY_TRAILER)
+                buf.seek(0)
+                cursor.copy_expert(copy_stmt, buf)
+
+    def _invalidate_column_cache(self, table_uuid: UUID) -> None:
+        self.sesh.info.setdefault("column_cache", {}).pop(table_uuid, None)
+        self.sesh.info.setdefault("tableclause_cache", {}).pop(table_uuid, None)
+
+    def get_row(
+        self,
+        table_uuid: UUID,
+        row_id: int,
+        columns: Optional[Sequence[Column]] = None,
+    ) -> Optional[Row]:
+        """Get a single row.
+
+        Callers that hold a Table object already know the columns and can
+        pass them to save looking them up again.
+
+        """
+        if columns is None:
+            columns = self.get_columns(table_uuid)
         table_clause = self._get_userdata_tableclause(table_uuid)
         cursor = self.sesh.execute(
             table_clause.select().where(table_clause.c.csvbase_row_id == row_id)
@@ -142,7 +282,9 @@ class PGUserdataAdapter:
         if row is None:
             return None
         else:
-            return {c: row._mapping[c.name] for c in columns}
+            # positional: the select returns the columns in order, so no
+            # need for a by-name hash lookup per cell
+            return dict(zip(columns, row))
 
     def min_row_id(self, table_uuid: UUID) -> int:
         """Returns the lowest row id in the table, or if there are no rows, 0."""
@@ -175,12 +317,15 @@ class PGUserdataAdapter:
         cursor = self.sesh.execute(stmt)
         return cursor.fetchone()
 
-    def get_a_sample_row(self, table_uuid: UUID) -> Row:
+    def get_a_sample_row(
+        self, table_uuid: UUID, columns: Optional[Sequence[Column]] = None
+    ) -> Row:
         """Returns a sample row from the table (the lowest row id).
 
         If none exist, a made-up row is returned.  This function is for
         example/documentation purposes only."""
-        columns = self.get_columns(table_uuid)
+        if columns is None:
+            columns = self.get_columns(table_uuid)
         table_clause = self._get_userdata_tableclause(table_uuid)
         cursor = self.sesh.execute(
             table_clause.select().order_by("csvbase_row_id").limit(1)
@@ -190,9 +335,16 @@ class PGUserdataAdapter:
             # return something made-up
             return {c: c.type_.example() for c in columns}
         else:
-            return {c: row._mapping[c.name] for c in columns}
+            return dict(zip(columns, row))
 
     def insert_row(self, table_uuid: UUID, row: Row) -> int:
+        """Insert a single row, returning the csvbase_row_id.
+
+        This is for one-at-a-time operations (eg the row create endpoint) -
+        don't call it in a loop, bulk inserts should go via insert_table_data
+        which uses COPY.
+
+        """
         table = self._get_userdata_tableclause(table_uuid)
         values = {c.name: v for c, v in row.items()}
         return self.sesh.execute(
@@ -244,26 +396,30 @@ class PGUserdataAdapter:
             keyset_sub = select(keyset_page.alias())  # type: ignore
             keyset_page = keyset_sub.order_by(*key_names)
 
-        row_tuples: List[RowProxy] = list(self.sesh.execute(keyset_page))
-
-        if len(row_tuples) > 1:
-            first_row = row_tuples[0]
-            last_row = row_tuples[-1]
-
-            has_more_vals = satuple(
-                *[getattr(last_row, colname) for colname in key_names]
-            )
-            has_more_q = (
-                table_clause.select().where(table_vals > has_more_vals).exists()  # type: ignore
-            )
-            has_more = self.sesh.query(has_more_q).scalar()
-            has_less_vals = satuple(
-                *[getattr(first_row, colname) for colname in key_names]
-            )
-            has_less_q = (
-                table_clause.select().where(table_vals < has_less_vals).exists()  # type: ignore
-            )
-            has_less = self.sesh.query(has_less_q).scalar()
+        # Fetch the page and both pagination flags in a single query (rather
+        # than three) by attaching EXISTS probes against the page's min and
+        # max row ids.  The "csvbase_" prefix is reserved, so the labels can't
+        # clash with user columns.
+        page_cte = keyset_page.cte("page")
+        max_row_id = select(func.max(page_cte.c.csvbase_row_id)).scalar_subquery()  # type: ignore
+        min_row_id = select(func.min(page_cte.c.csvbase_row_id)).scalar_subquery()  # type: ignore
+        stmt = select(
+            page_cte,  # type: ignore
+            table_clause.select()  # type: ignore
+            .where(table_clause.c.csvbase_row_id > max_row_id)
+            .exists()
+            .label("csvbase_has_more"),
+            table_clause.select()  # type: ignore
+            .where(table_clause.c.csvbase_row_id < min_row_id)
+            .exists()
+            .label("csvbase_has_less"),
+        ).order_by(page_cte.c.csvbase_row_id)
+
+        row_tuples: List[RowProxy] = list(self.sesh.execute(stmt))
+
+        if len(row_tuples) > 0:
+            has_more = row_tuples[0]._mapping["csvbase_has_more"]
+            has_less = row_tuples[0]._mapping["csvbase_has_less"]
         else:
             if keyset.op == "greater_than":
                 has_more = False
@@ -276,10 +432,9 @@ class PGUserdataAdapter:
                 ).scalar()
                 has_less = False
 
-        rows = [
-            {c: row_tup._mapping[c.name] for c in table.columns}
-            for row_tup in row_tuples
-        ]
+        # zip is positional (and stops before the trailing flag columns),
+        # avoiding a by-name hash lookup for every cell
+        rows = [dict(zip(table.columns, row_tup)) for row_tup in row_tuples]
 
         return Page(
             has_less=has_less,
@@ -293,15 +448,63 @@ class PGUserdataAdapter:
     ) -> Iterable[Sequence[PythonType]]:
         # To a first approximation this is about 10 times slower than COPY
 
-        batchsize = 10_000
-        table_clause = self._get_userdata_tableclause(table_uuid)
+        # this goes via a raw, server-side cursor: the result set is streamed
+        # rather than buffered client-side, and plain tuples come back instead
+        # of SQLAlchemy Row objects (which cost noticeably on big exports).
+        # get_columns is cached on the session, so starting an export costs at
+        # most one metadata query
         columns = self.get_columns(table_uuid)
-        q = (
-            select(*[getattr(table_clause.c, c.name) for c in columns])
-            .order_by(table_clause.c.csvbase_row_id)
-            .execution_options(yield_per=batchsize)
+        q = pgsql.SQL("SELECT {} FROM {} ORDER BY csvbase_row_id").format(
+            pgsql.SQL(", ").join(pgsql.Identifier(c.name) for c in columns),
+            pgsql.Identifier("userdata", self._make_userdata_table_name(table_uuid)),
         )
-        yield from self.sesh.execute(q)
+        raw_conn = self.sesh.connection().connection
+        cursor_name = self._make_temp_table_name(prefix="table_as_rows")
+        with raw_conn.cursor(name=cursor_name) as cursor:
+            cursor.itersize = 10_000
+            cursor.execute(q)
+            yield from cursor
+
+    def table_as_csv(
+        self, table_uuid: UUID, buf: Optional[IO[bytes]] = None
+    ) -> IO[bytes]:
+        """Write the whole table, as csv, into the given buffer.
+
+        This has Postgres do the csv serialisation (via COPY TO) which is a
+        lot quicker than pulling the rows into Python and going through the
+        csv module row by row.
+
+        """
+        select_list = []
+        for column in self.get_columns(table_uuid):
+            ident = pgsql.Identifier(column.name)
+            if column.type_ is ColumnType.BOOLEAN:
+                # match what Python's csv module would write, rather than
+                # Postgres's "t"/"f"
+                select_list.append(
+                    pgsql.SQL(
+                        "CASE WHEN {i} THEN 'True' WHEN NOT {i} THEN 'False' END AS {i}"
+                    ).format(i=ident)
+                )
+            elif column.type_ is ColumnType.FLOAT:
+                # go via numeric to prevent scientific notation making it into
+                # the csv - some csv parsers handle that but many choke
+                select_list.append(pgsql.SQL("{i}::numeric AS {i}").format(i=ident))
+            else:
+                select_list.append(ident)
+        copy_stmt = pgsql.SQL(
+            "COPY (SELECT {} FROM {} ORDER BY csvbase_row_id) "
+            "TO STDOUT WITH (FORMAT CSV, HEADER true)"
+        ).format(
+            pgsql.SQL(", ").join(select_list),
+            pgsql.Identifier("userdata", self._make_userdata_table_name(table_uuid)),
+        )
+        buf = buf or io.BytesIO()
+        with rewind(buf):
+            raw_conn = self.sesh.connection().connection
+            with raw_conn.cursor() as cursor:
+                cursor.copy_expert(copy_stmt, buf)
+        return buf
 
     def insert_table_data(
         self,
@@ -309,24 +512,120 @@ class PGUserdataAdapter:
         columns: Sequence[Column],
         rows: Iterable[Sequence[PythonType]],
     ) -> None:
+        """Bulk-append rows to a table.
+
+        This always goes via binary COPY - there is no "small batch" path
+        because COPY's setup cost is negligible even for a handful of rows.
+
+        """
         temp_table_name = self._make_temp_table_name(prefix="insert")
-        main_table_name = self._make_userdata_table_name(
-            table.table_uuid, with_schema=True
+        main_tableclause = self._get_userdata_tableclause(table.table_uuid)
+        self.sesh.execute(
+            CreateTempTableLike(satable(temp_table_name), main_tableclause)
         )
+
+        self._copy_in_binary(temp_table_name, columns, rows)
+
+        self._insert_from_temp_table(table, temp_table_name, [c.name for c in columns])
+
+    def insert_table_data_from_csv(
+        self,
+        table: Table,
+        columns: Sequence[Column],
+        csv_buf: UserSubmittedCSVData,
+        dialect: Type[csv.Dialect],
+    ) -> None:
+        """COPY a csv file into the table, having Postgres parse it.
+
+        Postgres's csv parser is many times faster than going cell-by-cell in
+        Python via csv_to_rows.  Where Postgres can't parse a value that our
+        own (more lenient) converters would accept - eg thousands separators
+        in numbers - fall back to the Python parser.
+
+        """
+        temp_table_name = self._make_temp_table_name(prefix="insert")
         main_tableclause = self._get_userdata_tableclause(table.table_uuid)
         self.sesh.execute(
             CreateTempTableLike(satable(temp_table_name), main_tableclause)
         )
+        self._stage_csv(temp_table_name, columns, csv_buf, dialect)
+        self._insert_from_temp_table(table, temp_table_name, [c.name for c in columns])
 
-        raw_conn = self.sesh.connection().connection
+    def _stage_csv(
+        self,
+        temp_table_name: str,
+        columns: Sequence[Column],
+        csv_buf: UserSubmittedCSVData,
+        dialect: Type[csv.Dialect],
+    ) -> None:
+        """COPY a csv file into a staging temp table, preferring to have
+        Postgres do the parsing.
+
+        The whole buffer (header included) is streamed as-is: HEADER true
+        makes Postgres skip the header line server-side, so no Python-level
+        tokenisation happens at all on this path.
+
+        """
         column_names = [c.name for c in columns]
-        copy_manager = CopyManager(
-            raw_conn,
-            temp_table_name,
-            column_names,
+        all_types_copyable = all(c.type_ in COPYABLE_COLUMN_TYPES for c in columns)
+        if all_types_copyable and self._dialect_is_copyable(dialect):
+            column_idents = pgsql.SQL(", ").join(
+                pgsql.Identifier(cn) for cn in column_names
+            )
+            copy_stmt = pgsql.SQL(
+                "COPY {} ({}) FROM STDIN WITH "
+                "(FORMAT CSV, HEADER true, DELIMITER {}, QUOTE {}, FORCE_NULL ({}))"
+            ).format(
+                pgsql.Identifier(temp_table_name),
+                column_idents,
+                pgsql.Literal(dialect.delimiter),
+                pgsql.Literal(dialect.quotechar),
+                column_idents,
+            )
+            # the savepoint is managed on the raw connection, like the COPY
+            # itself, so that a failed COPY doesn't abort the enclosing
+            # transaction
+            raw_conn = self.sesh.connection().connection
+            with raw_conn.cursor() as cursor:
+                cursor.execute("SAVEPOINT csv_copy")
+                try:
+                    cursor.copy_expert(copy_stmt, csv_buf)
+                except psycopg2.DataError:
+                    logger.warning(
+                        "postgres could not parse the csv, re-parsing in python"
+                    )
+                    cursor.execute("ROLLBACK TO SAVEPOINT csv_copy")
+                    csv_buf.seek(0)
+                else:
+                    cursor.execute("RELEASE SAVEPOINT csv_copy")
+                    return
+
+        rows = table_io.csv_to_rows(csv_buf, columns, dialect)
+        self._copy_in_binary(temp_table_name, columns, rows)
+
+    # NOTE: Could be a function
+    def _dialect_is_copyable(self, dialect: Type[csv.Dialect]) -> bool:
+        """Whether COPY's csv parser can be configured to match the dialect.
+
+        COPY has no equivalent of skipinitialspace or non-doubled quote
+        escaping, so csv files in those dialects have to be parsed in Python.
+
+        """
+        return (
+            not dialect.skipinitialspace
+            and dialect.doublequote
+            and dialect.escapechar is None
         )
-        copy_manager.copy(rows)
 
+    def _insert_from_temp_table(
+        self, table: Table, temp_table_name: str, column_names: Sequence[str]
+    ) -> None:
+        """Move freshly COPYed data from a temp table into the main table,
+        allocating csvbase_row_ids where they are missing."""
+        main_table_name = self._make_userdata_table_name(
+            table.table_uuid, with_schema=True
+        )
+        main_tableclause = self._get_userdata_tableclause(table.table_uuid)
         temp_tableclause = self._get_tableclause(temp_table_name, table.columns)
 
         add_stmt_select_columns = [getattr(temp_tableclause.c, c) for c in column_names]
@@ -383,6 +682,7 @@ class PGUserdataAdapter:
     def drop_table(self, table_uuid: UUID) -> None:
         sa_table = self._get_userdata_tableclause(table_uuid)
         self.sesh.execute(DropTable(sa_table))  # type: ignore
+        self._invalidate_column_cache(table_uuid)
 
     def create_table(self, table_uuid: UUID, columns: Iterable[Column]) -> UUID:
         cols: List[SAColumn] = [
@@ -417,6 +717,7 @@ class PGUserdataAdapter:
             schema="userdata",
         )
         self.sesh.execute(CreateTable(table))
+        self._invalidate_column_cache(table_uuid)
         return table_uuid
 
     def copy_table_data(self, from_table_uuid: UUID, to_table_uuid: UUID) -> None:
@@ -440,26 +741,60 @@ class PGUserdataAdapter:
         that are present in the SQL table.  If the csvbase_row_id column is
         present, it will be used to correlate changes.
 
-        """
+        This deliberately all happens on the one connection: temp tables are
+        session-local, so the staging COPY and the merge DML can't be fanned
+        out over parallel connections without giving up the atomicity of the
+        caller's transaction.
 
+        """
         # First, make a temp table and COPY the new rows into it
         temp_table_name = self._make_temp_table_name(prefix="upsert")
-        main_table_name = self._make_userdata_table_name(
-            table.table_uuid, with_schema=True
+        main_tableclause = self._get_userdata_tableclause(table.table_uuid)
+        self.sesh.execute(
+            CreateTempTableLike(satable(temp_table_name), main_tableclause)
         )
+        self._copy_in_binary(temp_table_name, row_columns, rows)
+        self._upsert_from_temp_table(table, temp_table_name, row_columns, key)
+
+    def upsert_table_data_from_csv(
+        self,
+        table: Table,
+        row_columns: Sequence[Column],
+        csv_buf: UserSubmittedCSVData,
+        dialect: Type[csv.Dialect],
+        key: Sequence[Column] = (ROW_ID_COLUMN,),
+    ) -> None:
+        """As upsert_table_data, but COPYing the csv file directly so that
+        Postgres does the parsing (see insert_table_data_from_csv)."""
+        temp_table_name = self._make_temp_table_name(prefix="upsert")
         main_tableclause = self._get_userdata_tableclause(table.table_uuid)
         self.sesh.execute(
             CreateTempTableLike(satable(temp_table_name), main_tableclause)
         )
-        raw_conn = self.sesh.connection().connection
-        upsert_column_names = [c.name for c in row_columns]
-        existing_column_names = [c.name for c in table.columns]
-        copy_manager = CopyManager(raw_conn, temp_table_name, upsert_column_names)
-        copy_manager.copy(rows)
+        self._stage_csv(temp_table_name, row_columns, csv_buf, dialect)
+        self._upsert_from_temp_table(table, temp_table_name, row_columns, key)
 
-        # Next selectively use the temp table to update the 'main' one
+    def _upsert_from_temp_table(
+        self,
+        table: Table,
+        temp_table_name: str,
+        row_columns: Sequence[Column],
+        key: Sequence[Column],
+    ) -> None:
+        """Selectively use a freshly COPYed temp table to update the 'main'
+        one."""
+        main_table_name = self._make_userdata_table_name(
+            table.table_uuid, with_schema=True
+        )
+        main_tableclause = self._get_userdata_tableclause(table.table_uuid)
+        existing_column_names = [c.name for c in table.columns]
         temp_tableclause = self._get_tableclause(temp_table_name, table.columns)
 
+        # For the duration of this transaction only, don't wait for WAL
+        # flush on commit.  Uploads are resubmittable so the (tiny) risk of
+        # losing the very last moments of work on a server crash is fine.
+        self.sesh.execute(text("SET LOCAL synchronous_commit = off"))
+
         join_clause = [
             (main_tableclause.c[key_column.name] == temp_tableclause.c[key_column.name])
             for key_column in key
@@ -542,11 +877,28 @@ class PGUserdataAdapter:
             ),
         )
 
-        self.sesh.execute(remove_stmt)
-        self.sesh.execute(update_stmt)
-        self.sesh.execute(add_stmt_no_blanks)
-        self._reset_pk_sequence(main_tableclause)
-        self.sesh.execute(add_stmt_blanks)
+        # These statements carry no bind parameters (all the data is already
+        # in the temp table) so they can be compiled and sent as one
+        # multi-statement string - a single roundtrip rather than five.
+        # psycopg2 runs them sequentially, which setval/nextval relies on.
+        pg_dialect = self.sesh.get_bind().dialect
+        compiled_stmts = [
+            str(
+                stmt.compile(  # type: ignore
+                    dialect=pg_dialect, compile_kwargs={"literal_binds": True}
+                )
+            )
+            for stmt in [
+                remove_stmt,
+                update_stmt,
+                add_stmt_no_blanks,
+                self._reset_pk_sequence_stmt(main_tableclause),
+                add_stmt_blanks,
+            ]
+        ]
+        raw_conn = self.sesh.connection().connection
+        with raw_conn.cursor() as cursor:
+            cursor.execute(";\n".join(compiled_stmts))
 
     def byte_count(self, table_uuid: UUID) -> int:
         # pg_total_relation_size returns the size of the table plus toast, plus
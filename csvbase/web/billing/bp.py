@@ -111,9 +111,7 @@ def success(payment_reference_uuid: str) -> Response:
 
     user_uuid, payment_reference = payment_ref_tup
 
-    checkout_session = stripe.checkout.Session.retrieve(
-        payment_reference, expand=["subscription"]
-    )
+    checkout_session = svc.retrieve_checkout_session(payment_reference)
 
     svc.insert_stripe_customer_id(sesh, user_uuid, checkout_session.customer)
     svc.insert_stripe_subscription(sesh, user_uuid, checkout_session.subscription)
@@ -1,4 +1,4 @@
-from typing import Tuple, Optional, Iterable
+from typing import Any, Dict, Tuple, Optional, Iterable
 from datetime import timedelta, datetime, timezone
 from uuid import UUID
 from logging import getLogger
@@ -35,6 +35,33 @@ def record_payment_reference(
     )
 
 
+CHECKOUT_SESSION_CACHE_TTL = timedelta(minutes=1)
+
+_checkout_session_cache: Dict[str, Tuple[datetime, Any]] = {}
+
+
+def retrieve_checkout_session(payment_reference: str):
+    """Retrieve a checkout session from stripe, caching it briefly.
+
+    Users quite often reload the success url, and the answer doesn't change -
+    no point asking stripe again each time.
+
+    """
+    now = datetime.now(timezone.utc)
+    cached = _checkout_session_cache.get(payment_reference)
+    if cached is not None and (now - cached[0]) < CHECKOUT_SESSION_CACHE_TTL:
+        return cached[1]
+    checkout_session = stripe.checkout.Session.retrieve(
+        payment_reference, expand=["subscription"]
+    )
+    # prune anything stale so this doesn't grow without bound
+    for key, (cached_at, _) in list(_checkout_session_cache.items()):
+        if (now - cached_at) >= CHECKOUT_SESSION_CACHE_TTL:
+            del _checkout_session_cache[key]
+    _checkout_session_cache[payment_reference] = (now, checkout_session)
+    return checkout_session
+
+
 def get_payment_reference(
     sesh: Session, payment_reference_uuid: UUID
 ) -> Optional[Tuple[UUID, str]]:
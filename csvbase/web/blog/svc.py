@@ -66,7 +66,7 @@ def get_post(sesh: Session, post_id: int) -> Post:
     username, table_name = get_blog_ref()
     table = get_table(sesh, username, table_name)
     backend = PGUserdataAdapter(sesh)
-    row = backend.get_row(table.table_uuid, post_id)
+    row = backend.get_row(table.table_uuid, post_id, columns=table.columns)
     if row is None:
         raise exc.RowDoesNotExistException(username, table_name, post_id)
     return post_from_row(row)
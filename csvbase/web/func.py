@@ -22,11 +22,16 @@ logger = getLogger(__name__)
 
 
 def is_browser() -> bool:
-    # FIXME: this should call negotiate_content_type
-    # bit of content negotiation magic
-    accepts = werkzeug.http.parse_accept_header(request.headers.get("Accept"))
-    best = accepts.best_match(["text/html", "text/csv"], default="text/csv")
-    return best == "text/html"
+    # this gets called repeatedly (from templates as well as view code) so the
+    # answer is worked out once per request and cached on the request object
+    # (not g, which tests don't tear down between requests)
+    if not hasattr(request, "is_browser"):
+        # FIXME: this should call negotiate_content_type
+        # bit of content negotiation magic
+        accepts = werkzeug.http.parse_accept_header(request.headers.get("Accept"))
+        best = accepts.best_match(["text/html", "text/csv"], default="text/csv")
+        request.is_browser = best == "text/html"  # type: ignore
+    return request.is_browser  # type: ignore
 
 
 def set_current_user(user: User) -> None:
@@ -122,7 +127,9 @@ def format_timedelta(
 _URL_REGEX = re.compile("https?://[^ ]+$")
 
 
-@functools.lru_cache
+# bounded - this gets called on arbitrary cell values so an unbounded cache
+# would grow with every distinct value rendered
+@functools.lru_cache(maxsize=4096)
 def is_url(text_string: str) -> bool:
     """Returns true if the text string is a url.
 
@@ -132,15 +139,11 @@ def is_url(text_string: str) -> bool:
 
     """
     # as an optimisation, make sure it vaguely looks like a fully qualified url
-    # before even trying to parse it
-    if _URL_REGEX.match(text_string):
-        try:
-            urlparse(text_string)
-            return True
-        except ValueError:
-            pass
-
-    return False
+    # before even trying the regex - most cell values don't
+    return bool(
+        text_string.startswith(("http://", "https://"))
+        and _URL_REGEX.match(text_string)
+    )
 
 
 def safe_redirect(to_raw: str) -> Response:
@@ -236,18 +236,18 @@ class TableView(MethodView):
 
             str_buf = get_user_str_buf()
             dialect, csv_columns = streams.peek_csv(str_buf, table.columns)
-            rows = table_io.csv_to_rows(str_buf, csv_columns, dialect)
 
             # If there is no csvbase_row_id column, don't try to correlate
             # updates, just wipe the table and insert everything.
             if "csvbase_row_id" not in set(c.name for c in csv_columns):
                 backend.delete_table_data(table)
-                backend.insert_table_data(table, csv_columns, rows)
+                backend.insert_table_data_from_csv(table, csv_columns, str_buf, dialect)
             else:
-                backend.upsert_table_data(
+                backend.upsert_table_data_from_csv(
                     table,
                     csv_columns,
-                    rows,
+                    str_buf,
+                    dialect,
                 )
             status = 200
             message = f"upserted {username}/{table_name}"
@@ -266,7 +266,6 @@ class TableView(MethodView):
 
             str_buf = get_user_str_buf()
             dialect, csv_columns = streams.peek_csv(str_buf)
-            rows = table_io.csv_to_rows(str_buf, csv_columns, dialect)
             is_public = request.args.get("public", default=False, type=bool)
             table_uuid = svc.create_table_metadata(
                 sesh,
@@ -279,7 +278,7 @@ class TableView(MethodView):
             )
             backend.create_table(table_uuid, csv_columns)
             table = svc.get_table(sesh, username, table_name)
-            backend.insert_table_data(table, csv_columns, rows)
+            backend.insert_table_data_from_csv(table, csv_columns, str_buf, dialect)
             status = 201
             message = f"created {username}/{table_name}"
         svc.update_upstream(sesh, table)
@@ -313,13 +312,12 @@ class TableView(MethodView):
 
         str_buf = get_user_str_buf()
         dialect, columns = streams.peek_csv(str_buf, table.columns)
-        rows = table_io.csv_to_rows(str_buf, columns, dialect)
 
         # FIXME: check that columns is a subset of table_columns
         # table_columns = PGUserdataAdapter.get_columns(sesh, columns)
 
         backend = PGUserdataAdapter(sesh)
-        backend.insert_table_data(table, columns, rows)
+        backend.insert_table_data_from_csv(table, columns, str_buf, dialect)
 
         message = f"Updated {username}/{table_name}"
         response = jsonify({"message": message})
@@ -451,18 +449,20 @@ def make_table_view_response(sesh, content_type: ContentType, table: Table) -> R
             with repcache.open(
                 table.table_uuid, content_type, table.last_changed, mode="wb"
             ) as rep_file:
-                columns = backend.get_columns(table.table_uuid)
-                rows = backend.table_as_rows(table.table_uuid)
-                if content_type is ContentType.PARQUET:
-                    table_io.rows_to_parquet(columns, rows, rep_file)
-                elif content_type is ContentType.JSON_LINES:
-                    table_io.rows_to_jsonlines(columns, rows, rep_file)
-                elif content_type is ContentType.XLSX:
-                    table_io.rows_to_xlsx(
-                        columns, rows, excel_table=False, buf=rep_file
-                    )
+                if content_type is ContentType.CSV:
+                    # csv serialisation is done by the database itself
+                    backend.table_as_csv(table.table_uuid, buf=rep_file)
                 else:
-                    table_io.rows_to_csv(columns, rows, buf=rep_file)
+                    columns = backend.get_columns(table.table_uuid)
+                    rows = backend.table_as_rows(table.table_uuid)
+                    if content_type is ContentType.PARQUET:
+                        table_io.rows_to_parquet(columns, rows, rep_file)
+                    elif content_type is ContentType.JSON_LINES:
+                        table_io.rows_to_jsonlines(columns, rows, rep_file)
+                    else:
+                        table_io.rows_to_xlsx(
+                            columns, rows, excel_table=False, buf=rep_file
+                        )
 
         if get_config().x_accel_redirect:
             response = make_response()
@@ -649,7 +649,7 @@ def get_table_apidocs(username: str, table_name: str) -> str:
 
     made_up_row = svc.get_a_made_up_row(sesh, table.table_uuid)
     backend = PGUserdataAdapter(sesh)
-    sample_row = backend.get_a_sample_row(table.table_uuid)
+    sample_row = backend.get_a_sample_row(table.table_uuid, columns=table.columns)
     sample_page = Page(has_less=False, has_more=True, rows=[sample_row])
 
     reps = get_table_reps(sesh, table)
@@ -937,7 +937,7 @@ class RowView(MethodView):
         table = svc.get_table(sesh, username, table_name)
         ensure_table_access(sesh, table, "read")
         backend = PGUserdataAdapter(sesh)
-        row = backend.get_row(table.table_uuid, row_id)
+        row = backend.get_row(table.table_uuid, row_id, columns=table.columns)
         if row is None:
             raise exc.RowDoesNotExistException(username, table_name, row_id)
 
@@ -1065,7 +1065,7 @@ def row_delete_check(username: str, table_name: str, row_id: int) -> Response:
     ensure_table_access(sesh, table, "write")
     ensure_not_read_only(table)
     backend = PGUserdataAdapter(sesh)
-    row = backend.get_row(table.table_uuid, row_id)
+    row = backend.get_row(table.table_uuid, row_id, columns=table.columns)
     if row is None:
         raise exc.RowDoesNotExistException(username, table_name, row_id)
 
@@ -15,7 +15,7 @@ from flask import Blueprint, redirect, render_template, url_for, request
 from werkzeug.wrappers.response import Response
 
 from ..func import get_current_user_or_401, register_and_sign_in_new_user
-from ... import exc, svc, streams, table_io, temp
+from ... import exc, svc, streams, temp
 from ...sesh import get_sesh
 from ...userdata import PGUserdataAdapter
 from ...follow.git import GitSource
@@ -208,9 +208,8 @@ class CreateTableConfirm(MethodView):
             backend.create_table(table_uuid, columns)
             str_buf = streams.byte_buf_to_str_buf(gh_f.filelike)
             dialect = streams.sniff_csv(str_buf)
-            rows = table_io.csv_to_rows(str_buf, columns, dialect)
             table = svc.get_table(sesh, current_user.username, table_name)
-            backend.insert_table_data(table, columns, rows)
+            backend.insert_table_data_from_csv(table, columns, str_buf, dialect)
         svc.mark_table_changed(sesh, table.table_uuid)
         sesh.commit()
         return redirect(
@@ -276,15 +275,15 @@ def new_table_form_submission() -> Response:
     try:
         dialect, columns = streams.peek_csv(csv_buf)
         backend.create_table(table_uuid, columns)
-        rows = table_io.csv_to_rows(csv_buf, columns, dialect)
     except UnicodeDecodeError as e:
         raise exc.WrongEncodingException() from e
 
     table = svc.get_table(sesh, current_user.username, table_name)
-    backend.insert_table_data(
+    backend.insert_table_data_from_csv(
         table,
         columns,
-        rows,
+        csv_buf,
+        dialect,
     )
     svc.mark_table_changed(sesh, table.table_uuid)
     sesh.commit()
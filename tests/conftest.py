@@ -20,6 +20,8 @@ from .utils import make_user, create_table, local_only_gitsource
 
 @pytest.fixture(scope="session")
 def crypt_context():
+    # plaintext rather than argon2 - password hashing is deliberately slow and
+    # make_user gets called a lot
     return CryptContext(["plaintext"])
 
 
@@ -36,12 +38,23 @@ def app(crypt_context):
 
     # Speeds things up considerably when testing
     a.config["CRYPT_CONTEXT"] = crypt_context
+
+    # NOTE: the app is built once per session but the client (from
+    # pytest-flask) stays function-scoped on purpose: clients carry cookies,
+    # so sharing one would leak sign-ins between tests, and constructing one
+    # is trivial anyway
     return a
 
 
 @pytest.fixture(scope="session")
 def engine():
-    return create_engine(get_db_url(), future=True)
+    # fixtures commit a lot and nothing here is precious, so don't wait for
+    # the WAL flush
+    return create_engine(
+        get_db_url(),
+        future=True,
+        connect_args={"options": "-c synchronous_commit=off"},
+    )
 
 
 @pytest.fixture(scope="session")
@@ -63,6 +76,22 @@ def sesh(session_cls):
         yield sesh_
 
 
+# NOTE: The classic speedup of running each test inside a rolled-back outer
+# transaction (with savepoints for isolation) doesn't work here: most tests go
+# through the flask test client and the app opens its own database sessions,
+# which would never see uncommitted fixture data.  Data made by fixtures is
+# really committed, so fixtures that get mutated (users especially - quotas,
+# subscriptions and settings are all per-user) stay function-scoped.
+@pytest.fixture(scope="function")
+def backend(sesh) -> PGUserdataAdapter:
+    """An adapter bound to the function-level session.
+
+    Sharing one means the session-level column caches are warm across a test.
+
+    """
+    return PGUserdataAdapter(sesh)
+
+
 @pytest.fixture(scope="function")
 def test_user(module_sesh, app):
     user = make_user(
@@ -73,6 +102,17 @@ def test_user(module_sesh, app):
     return user
 
 
+@pytest.fixture(scope="function")
+def other_user(module_sesh, app):
+    """A second user, for tests about what non-owners can see and do."""
+    user = make_user(
+        module_sesh,
+        app.config["CRYPT_CONTEXT"],
+    )
+    module_sesh.commit()
+    return user
+
+
 @pytest.fixture(scope="session")
 def configure_logging():
     basicConfig(level=DEBUG)
@@ -81,6 +121,10 @@ def configure_logging():
 ROMAN_NUMERALS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
 
 
+# NOTE: this can't be module-scoped, much as that would help the row crud
+# tests: several of them add/update/delete rows over the test client (ie: on
+# the app's own connections), so there is no savepoint that could put the
+# table back afterwards, and others assert on last_changed advancing.
 @pytest.fixture(scope="function")
 def ten_rows(test_user, sesh) -> Table:
     data = [
@@ -96,12 +140,33 @@ def ten_rows(test_user, sesh) -> Table:
 
     table = create_table(sesh, test_user, columns, caption="Roman numerals")
     backend = PGUserdataAdapter(sesh)
-    for row in data:
-        backend.insert_row(table.table_uuid, dict(zip(columns, row)))
+    backend.insert_table_data(table, columns, data)
     sesh.commit()
     return table
 
 
+@pytest.fixture()
+def row_url(test_user, ten_rows):
+    """Returns a function that builds urls for rows of the ten_rows table."""
+
+    def _row_url(row_id: int) -> str:
+        return f"/{test_user.username}/{ten_rows.table_name}/rows/{row_id}"
+
+    return _row_url
+
+
+@pytest.fixture()
+def table_json_url(test_user, ten_rows) -> str:
+    """The url for the json rep of the ten_rows table.
+
+    The mutation tests each GET this to check last_changed was bumped.  That
+    extra round trip is deliberate: every mutating handler has to remember to
+    bump last_changed separately, so each is checked on its own.
+
+    """
+    return f"/{test_user.username}/{ten_rows.table_name}.json"
+
+
 @pytest.fixture()
 def private_table(test_user, module_sesh):
     x_column = Column("x", type_=ColumnType.INTEGER)
@@ -1,4 +1,5 @@
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 from uuid import uuid4
 
 import sqlalchemy
@@ -19,25 +20,65 @@ import stripe
 import pytest
 
 
-def test_subscribe(client, test_user):
+@pytest.fixture(scope="module", autouse=True)
+def stripe_mock():
+    """Stands in for the stripe api, once for the whole module.
+
+    This is both faster than a patch.object per test and a guarantee that
+    nothing in here makes a real network call to stripe.  Tests just set
+    return_value/side_effect on the relevant mock.
+
+    """
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("unmocked stripe api call - add it to stripe_mock")
+
+    mocks = SimpleNamespace(
+        checkout_session_create=MagicMock(),
+        checkout_session_retrieve=MagicMock(),
+        billing_portal_session_create=MagicMock(),
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        # belt-and-braces: anything that slips past the mocks below (eg a new
+        # sdk call) fails instead of going over the wire
+        mp.setattr(stripe.api_requestor.APIRequestor, "request", no_network)
+        mp.setattr(bp.stripe.checkout.Session, "create", mocks.checkout_session_create)
+        mp.setattr(
+            bp.stripe.checkout.Session, "retrieve", mocks.checkout_session_retrieve
+        )
+        mp.setattr(
+            bp.stripe.billing_portal.Session,
+            "create",
+            mocks.billing_portal_session_create,
+        )
+        yield mocks
+
+
+@pytest.fixture(autouse=True)
+def reset_stripe_mock(stripe_mock):
+    yield
+    for mock in vars(stripe_mock).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
+def test_subscribe(client, test_user, stripe_mock):
     with current_user(test_user):
         fake_checkout_session = FakeStripeCheckoutSession(
             status="complete",
             payment_status="paid",
         )
-        with patch.object(bp.stripe.checkout.Session, "create") as mock_create:
-            mock_create.return_value = fake_checkout_session
-            subscribe_response = client.get("/billing/subscribe")
+        stripe_mock.checkout_session_create.return_value = fake_checkout_session
+        subscribe_response = client.get("/billing/subscribe")
     assert subscribe_response.status_code == 302
     assert subscribe_response.headers["Location"] == fake_checkout_session.url
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_subscribe__stripe_customer_already_exists(client, test_user):
     assert False
 
 
-def test_subscribe__stripe_rejects_customer_email(client, sesh, app):
+def test_subscribe__stripe_rejects_customer_email(client, sesh, app, stripe_mock):
     crypt_context = app.config["CRYPT_CONTEXT"]
     test_user = create_user(
         sesh, crypt_context, random_string(), random_string(), email="darth@deathstar"
@@ -61,9 +102,8 @@ def test_subscribe__stripe_rejects_customer_email(client, sesh, app):
             return fake_checkout_session
 
     with current_user(test_user):
-        with patch.object(bp.stripe.checkout.Session, "create") as mock_create:
-            mock_create.side_effect = reject_if_email_present
-            subscribe_response = client.get("/billing/subscribe")
+        stripe_mock.checkout_session_create.side_effect = reject_if_email_present
+        subscribe_response = client.get("/billing/subscribe")
     assert subscribe_response.status_code == 302
     assert subscribe_response.headers["Location"] == fake_checkout_session.url
 
@@ -77,18 +117,19 @@ def test_subscribe__not_signed_in(client):
     assert subscribe_response.headers["Location"] == "/register"
 
 
-def test_subscribe__stripe_rejects_for_other_reason(client, test_user):
+def test_subscribe__stripe_rejects_for_other_reason(client, test_user, stripe_mock):
     with current_user(test_user):
-        with patch.object(bp.stripe.checkout.Session, "create") as mock_create:
-            mock_create.side_effect = stripe.error.InvalidRequestError(
+        stripe_mock.checkout_session_create.side_effect = (
+            stripe.error.InvalidRequestError(
                 message="Something else",
                 param="something",
             )
-            with pytest.raises(stripe.error.InvalidRequestError):
-                client.get("/billing/subscribe")
+        )
+        with pytest.raises(stripe.error.InvalidRequestError):
+            client.get("/billing/subscribe")
 
 
-def test_success_url(client, sesh, test_user):
+def test_success_url(client, sesh, test_user, stripe_mock):
     payment_reference_uuid = uuid4()
     payment_reference = random_string()
     svc.record_payment_reference(
@@ -96,15 +137,14 @@ def test_success_url(client, sesh, test_user):
     )
     sesh.commit()
 
-    with patch.object(bp.stripe.checkout.Session, "retrieve") as mock_retrieve:
-        mock_retrieve.return_value = FakeStripeCheckoutSession(
-            id=payment_reference,
-            customer=random_string(),
-            url=random_string(),
-            status="complete",
-            payment_status="paid",
-        )
-        resp = client.get(f"/billing/success/{str(payment_reference_uuid)}")
+    stripe_mock.checkout_session_retrieve.return_value = FakeStripeCheckoutSession(
+        id=payment_reference,
+        customer=random_string(),
+        url=random_string(),
+        status="complete",
+        payment_status="paid",
+    )
+    resp = client.get(f"/billing/success/{str(payment_reference_uuid)}")
 
     assert svc.get_stripe_customer_id(sesh, test_user.user_uuid) is not None
 
@@ -112,7 +152,7 @@ def test_success_url(client, sesh, test_user):
     assert resp.headers["Location"] == f"/{test_user.username}"
 
 
-def test_success_url__is_idempotent(client, sesh, test_user):
+def test_success_url__is_idempotent(client, sesh, test_user, stripe_mock):
     payment_reference_uuid = uuid4()
     payment_reference = random_string()
     svc.record_payment_reference(
@@ -120,16 +160,21 @@ def test_success_url__is_idempotent(client, sesh, test_user):
     )
     sesh.commit()
 
-    with patch.object(bp.stripe.checkout.Session, "retrieve") as mock_retrieve:
-        mock_retrieve.return_value = FakeStripeCheckoutSession(
-            id=payment_reference,
-            customer=random_string(),
-            url=random_string(),
-            status="complete",
-            payment_status="paid",
-        )
-        resp1 = client.get(f"/billing/success/{str(payment_reference_uuid)}")
-        resp2 = client.get(f"/billing/success/{str(payment_reference_uuid)}")
+    stripe_mock.checkout_session_retrieve.return_value = FakeStripeCheckoutSession(
+        id=payment_reference,
+        customer=random_string(),
+        url=random_string(),
+        status="complete",
+        payment_status="paid",
+    )
+    # two full request cycles on purpose - idempotency across real requests
+    # is exactly what's under test here
+    resp1 = client.get(f"/billing/success/{str(payment_reference_uuid)}")
+    resp2 = client.get(f"/billing/success/{str(payment_reference_uuid)}")
+
+    # the second request should have been served from the checkout session
+    # cache
+    assert stripe_mock.checkout_session_retrieve.call_count == 1
 
     assert svc.get_stripe_customer_id(sesh, test_user.user_uuid) is not None
 
@@ -145,26 +190,25 @@ def test_success_url__payment_reference_does_not_exist(client):
     assert resp.status_code == 404
 
 
-def test_manage__happy(client, sesh, test_user):
+def test_manage__happy(client, sesh, test_user, stripe_mock):
     stripe_customer_id = random_string()
     svc.insert_stripe_customer_id(sesh, test_user.user_uuid, stripe_customer_id)
     sesh.commit()
 
     with current_user(test_user):
         portal_session = FakeStripePortalSession()
-        with patch.object(bp.stripe.billing_portal.Session, "create") as mock_create:
-            mock_create.return_value = portal_session
-            resp = client.get("/billing/manage")
+        stripe_mock.billing_portal_session_create.return_value = portal_session
+        resp = client.get("/billing/manage")
     assert resp.status_code == 302
     assert resp.headers["Location"] == portal_session.url
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_manage__no_stripe_customer(client, sesh, test_user):
     assert False
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_manage__not_signed_in(client, sesh):
     assert False
 
@@ -180,7 +224,7 @@ def test_pricing__signed_in_but_no_subscription(client, test_user):
     assert pricing_resp.status_code == 200
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_pricing__signed_in_with_subscription(client, test_user):
     assert False
 
@@ -69,11 +69,11 @@ def test_convert__a_to_b(client, test_user, from_format, to_format):
     assert_frame_equal(SAMPLE_DATAFRAME, actual_dataframe)
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_convert__unreadable_file():
     assert False
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_convert__unknown_content_type():
     assert False
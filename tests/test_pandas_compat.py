@@ -83,7 +83,7 @@ def test_get_parquet(test_user, sesh, client, ten_rows) -> None:
     assert_frame_equal(df_from_csv, df_from_parquet)
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_putting_a_table_doesnt_break_adding_new_rows():
     # At the moment if you add a new row above the sequence, adding a row 500's.  Some sample code here:
     # https://stackoverflow.com/questions/244243/how-to-reset-postgres-primary-key-sequence-when-it-falls-out-of-sync
@@ -1,26 +1,28 @@
-from csvbase.value_objs import Column, ColumnType, ROW_ID_COLUMN
-from csvbase.userdata import PGUserdataAdapter
+import csv
+from io import StringIO
+
+import pytest
+from sqlalchemy import text
 
+from csvbase import exc
+from csvbase.value_objs import Column, ColumnType, ROW_ID_COLUMN
 from .utils import create_table
 
 
-def test_row_id_bounds(sesh, ten_rows):
-    backend = PGUserdataAdapter(sesh)
+def test_row_id_bounds(backend, ten_rows):
     min_row_id, max_row_id = backend.row_id_bounds(ten_rows.table_uuid)
     assert min_row_id == 1
     assert max_row_id == 10
 
 
-def test_row_id_bounds_empty_table(sesh, test_user):
-    backend = PGUserdataAdapter(sesh)
+def test_row_id_bounds_empty_table(sesh, test_user, backend):
     empty_table = create_table(sesh, test_user, [Column("a", ColumnType.TEXT)])
     min_row_id, max_row_id = backend.row_id_bounds(empty_table.table_uuid)
     assert min_row_id is None
     assert max_row_id is None
 
 
-def test_row_id_bounds_negative_row_ids(sesh, test_user):
-    backend = PGUserdataAdapter(sesh)
+def test_row_id_bounds_negative_row_ids(sesh, test_user, backend):
     a_col = Column("a", ColumnType.TEXT)
     csvbase_row_id_col = Column("csvbase_row_id", ColumnType.INTEGER)
     test_table = create_table(sesh, test_user, [a_col])
@@ -35,9 +37,105 @@ def test_row_id_bounds_negative_row_ids(sesh, test_user):
     assert max_row_id == 1
 
 
-def test_upsert__by_csvbase_row_id(sesh, test_user):
-    backend = PGUserdataAdapter(sesh)
+def test_insert_table_data_from_csv(sesh, test_user, backend):
+    n_col = Column("n", ColumnType.INTEGER)
+    test_table = create_table(sesh, test_user, [n_col])
+
+    csv_buf = StringIO("n\n1\n2\n3\n")
+    backend.insert_table_data_from_csv(test_table, [n_col], csv_buf, csv.excel)
+
+    assert list(backend.table_as_rows(test_table.table_uuid)) == [
+        (1, 1),
+        (2, 2),
+        (3, 3),
+    ]
+
+
+def test_insert_table_data_from_csv__python_fallback(sesh, test_user, backend):
+    """Values that Postgres's csv parser rejects (here: a thousands
+    separator) should still go in via the lenient Python parser."""
+    n_col = Column("n", ColumnType.INTEGER)
+    test_table = create_table(sesh, test_user, [n_col])
+
+    csv_buf = StringIO('n\n"1,000"\n2\n')
+    backend.insert_table_data_from_csv(test_table, [n_col], csv_buf, csv.excel)
+
+    assert list(backend.table_as_rows(test_table.table_uuid)) == [
+        (1, 1000),
+        (2, 2),
+    ]
+
 
+def test_insert_table_data__int4_column(sesh, test_user, backend):
+    """ColumnType.INTEGER covers both "integer" and "bigint" SQL columns and
+    the binary COPY format needs exact field widths, so the packers must
+    follow the column's real SQL type."""
+    n_col = Column("n", ColumnType.INTEGER)
+    test_table = create_table(sesh, test_user, [n_col])
+    sesh.execute(
+        text(
+            f"ALTER TABLE userdata.table_{test_table.table_uuid.hex} "
+            "ALTER COLUMN n TYPE integer"
+        )
+    )
+
+    backend.insert_table_data(test_table, [n_col], [(1,), (2,)])
+
+    assert list(backend.table_as_rows(test_table.table_uuid)) == [(1, 1), (2, 2)]
+
+
+def test_insert_table_data_from_csv__null_strings(sesh, test_user, backend):
+    """'nan' (and friends) mean NULL to our converters, but are a real NaN to
+    Postgres's csv parser - make sure they come out as NULL."""
+    f_col = Column("f", ColumnType.FLOAT)
+    test_table = create_table(sesh, test_user, [f_col])
+
+    csv_buf = StringIO("f\nnan\n1.5\n")
+    backend.insert_table_data_from_csv(test_table, [f_col], csv_buf, csv.excel)
+
+    assert list(backend.table_as_rows(test_table.table_uuid)) == [
+        (1, None),
+        (2, 1.5),
+    ]
+
+
+@pytest.mark.parametrize(
+    "column_type, cell",
+    [
+        # Postgres would read these as True and 2003-01-02 (or 2003-02-01,
+        # depending on DateStyle) respectively; our converters reject both
+        pytest.param(ColumnType.BOOLEAN, "1", id="boolean"),
+        pytest.param(ColumnType.DATE, "1/2/2003", id="date"),
+    ],
+)
+def test_insert_table_data_from_csv__stays_strict(
+    sesh, test_user, backend, column_type, cell
+):
+    a_col = Column("a", column_type)
+    test_table = create_table(sesh, test_user, [a_col])
+
+    csv_buf = StringIO(f"a\n{cell}\n")
+    with pytest.raises(exc.CSVParseError):
+        backend.insert_table_data_from_csv(test_table, [a_col], csv_buf, csv.excel)
+
+
+def test_upsert_table_data_from_csv__null_strings(sesh, test_user, backend):
+    """The upsert path stages csv the same way as the insert path, so it must
+    apply the same conversion semantics (see
+    test_insert_table_data_from_csv__null_strings)."""
+    f_col = Column("f", ColumnType.FLOAT)
+    test_table = create_table(sesh, test_user, [f_col])
+    backend.insert_table_data(test_table, [f_col], [(1.5,)])
+
+    csv_buf = StringIO("csvbase_row_id,f\n1,nan\n")
+    backend.upsert_table_data_from_csv(
+        test_table, [ROW_ID_COLUMN, f_col], csv_buf, csv.excel
+    )
+
+    assert list(backend.table_as_rows(test_table.table_uuid)) == [(1, None)]
+
+
+def test_upsert__by_csvbase_row_id(sesh, test_user, backend):
     n_col = Column("n", ColumnType.INTEGER)
     test_table = create_table(sesh, test_user, [n_col])
     backend.insert_table_data(test_table, [n_col], [[n] for n in range(1, 11)])
@@ -58,9 +156,7 @@ def test_upsert__by_csvbase_row_id(sesh, test_user):
     ]
 
 
-def test_upsert__by_other_unique_key(sesh, test_user):
-    backend = PGUserdataAdapter(sesh)
-
+def test_upsert__by_other_unique_key(sesh, test_user, backend):
     country_col = Column("country", ColumnType.TEXT)
     capital_col = Column("capital", ColumnType.TEXT)
     pop_col = Column("population", ColumnType.INTEGER)
@@ -4,7 +4,7 @@ import pytest
 
 from csvbase.value_objs import ContentType
 from csvbase.userdata import PGUserdataAdapter
-from .utils import make_user, assert_is_valid_etag, create_table, current_user
+from .utils import assert_is_valid_etag, create_table, current_user
 
 
 @pytest.fixture(scope="module", params=[ContentType.JSON, ContentType.HTML_FORM])
@@ -18,7 +18,9 @@ def accept_content_type(request):
     yield request.param
 
 
-def test_create__happy(client, ten_rows, test_user, accept_content_type):
+def test_create__happy(
+    client, ten_rows, test_user, accept_content_type, row_url, table_json_url
+):
     expected_resource = {
         "row_id": 11,
         "row": {
@@ -55,11 +57,11 @@ def test_create__happy(client, ten_rows, test_user, accept_content_type):
         assert post_resp.status_code == 201
         assert post_resp.json == expected_resource
 
-        row_resp = client.get(f"/{test_user.username}/{ten_rows.table_name}/rows/11")
+        row_resp = client.get(row_url(11))
         assert row_resp.status_code == 200, row_resp.data
         assert row_resp.json == expected_resource
 
-        table_resp = client.get(f"/{test_user.username}/{ten_rows.table_name}.json")
+        table_resp = client.get(table_json_url)
         assert (
             datetime.fromisoformat(table_resp.json["last_changed"])
             > ten_rows.last_changed
@@ -121,7 +123,7 @@ def test_create__wrong_type(
 
 
 def test_create__missing_column(
-    client, ten_rows, test_user, accept_content_type, post_content_type
+    client, ten_rows, test_user, accept_content_type, post_content_type, row_url
 ):
     kwargs = {"headers": {"Accept": accept_content_type.value}}
     if post_content_type is ContentType.JSON:
@@ -148,7 +150,7 @@ def test_create__missing_column(
     else:
         assert post_resp.status_code == 302
 
-    get_resp = client.get(f"/{test_user.username}/{ten_rows.table_name}/rows/11")
+    get_resp = client.get(row_url(11))
     expected = {
         "row_id": 11,
         "row": {
@@ -223,19 +225,17 @@ def test_create__not_authed(client, ten_rows, test_user):
     assert post_resp.json == {"error": "you need to sign in to do that"}
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_create__is_private_not_authed(client, private_table, test_user):
     assert False
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_create__is_private_am_authed(client, private_table, test_user):
     assert False
 
 
-def test_create__wrong_user(client, ten_rows, test_user, app, sesh):
-    other_user = make_user(sesh, app.config["CRYPT_CONTEXT"])
-    sesh.commit()
+def test_create__wrong_user(client, ten_rows, test_user, other_user):
     resp = client.post(
         f"/{test_user.username}/{ten_rows.table_name}/rows/",
         json={"row": {"roman_numeral": "XI"}},
@@ -245,9 +245,9 @@ def test_create__wrong_user(client, ten_rows, test_user, app, sesh):
     assert resp.json == {"error": "that's not allowed"}
 
 
-def test_read__happy(client, ten_rows, test_user, accept_content_type):
+def test_read__happy(client, ten_rows, test_user, accept_content_type, row_url):
     resp = client.get(
-        f"/{test_user.username}/{ten_rows.table_name}/rows/1",
+        row_url(1),
         headers={"Accept": accept_content_type.value},
     )
     assert resp.status_code == 200, resp.data
@@ -272,24 +272,26 @@ def test_read__happy(client, ten_rows, test_user, accept_content_type):
         }
 
 
-def test_read__no_accept(client, ten_rows, test_user):
+def test_read__no_accept(client, ten_rows, test_user, row_url):
     # Checks that JSON gets content negotiated by default
     resp = client.get(
-        f"/{test_user.username}/{ten_rows.table_name}/rows/1",
+        row_url(1),
     )
     assert resp.status_code == 200, resp.data
     assert resp.headers["Content-Type"] == ContentType.JSON.value
     assert resp.json["row_id"] == 1
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_read__etag_cache_hit():
     assert False
 
 
-def test_read__etag_cache_miss(client, ten_rows, test_user, accept_content_type):
+def test_read__etag_cache_miss(
+    client, ten_rows, test_user, accept_content_type, row_url
+):
     first_resp = client.get(
-        f"/{test_user.username}/{ten_rows.table_name}/rows/1",
+        row_url(1),
         headers={"Accept": accept_content_type.value, "If-None-Match": 'W/"rong etag"'},
     )
     assert first_resp.status_code == 200, first_resp.data
@@ -299,27 +301,34 @@ def test_read__etag_cache_miss(client, ten_rows, test_user, accept_content_type)
     assert_is_valid_etag(etag)
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_read__changed_data_changes_the_etag():
     assert False
 
 
-def test_read__row_does_not_exist(client, ten_rows, test_user):
-    resp = client.get(f"/{test_user.username}/{ten_rows.table_name}/rows/11")
-    assert resp.status_code == 404, resp.data
-    assert resp.json == {"error": "that row does not exist"}
-
-
-def test_read__table_does_not_exist(client, test_user):
-    resp = client.get(f"/{test_user.username}/something/rows/1")
-    assert resp.status_code == 404, resp.data
-    assert resp.json == {"error": "that table does not exist"}
-
-
-def test_read__user_does_not_exist(client, test_user):
-    resp = client.get("/someone/something/rows/1")
+@pytest.mark.parametrize(
+    "path_template, expected_error",
+    [
+        pytest.param(
+            "/{username}/{table_name}/rows/11", "that row does not exist", id="row"
+        ),
+        pytest.param(
+            "/{username}/something/rows/1", "that table does not exist", id="table"
+        ),
+        pytest.param(
+            "/someone/something/rows/1", "that user does not exist", id="user"
+        ),
+    ],
+)
+def test_read__does_not_exist(
+    client, ten_rows, test_user, path_template, expected_error
+):
+    path = path_template.format(
+        username=test_user.username, table_name=ten_rows.table_name
+    )
+    resp = client.get(path)
     assert resp.status_code == 404, resp.data
-    assert resp.json == {"error": "that user does not exist"}
+    assert resp.json == {"error": expected_error}
 
 
 def test_read__is_private_not_authed(client, private_table, test_user):
@@ -354,10 +363,9 @@ def test_read__is_private_am_authed(
 
 @pytest.mark.parametrize("is_public", [True, False])
 def test_read__as_another_user(
-    client, is_public, test_user, accept_content_type, crypt_context, sesh
+    client, is_public, test_user, accept_content_type, sesh, other_user
 ):
     table = create_table(sesh, test_user, is_public=is_public)
-    other_user = make_user(sesh, crypt_context)
     sesh.commit()
 
     with current_user(other_user):
@@ -374,9 +382,11 @@ def test_read__as_another_user(
 POST_CONTENT_TYPE_TO_VERB = {ContentType.HTML_FORM: "POST", ContentType.JSON: "PUT"}
 
 
-def test_update__happy(client, ten_rows, test_user, post_content_type):
+def test_update__happy(
+    client, ten_rows, test_user, post_content_type, row_url, table_json_url
+):
     """Test updating via POST(HTML, browser)/PUT(JSON, client)"""
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/1"
+    url = row_url(1)
     json_body = {
         "row_id": 1,
         "row": {
@@ -411,15 +421,17 @@ def test_update__happy(client, ten_rows, test_user, post_content_type):
     resp = client.get(url)
     assert resp.json == json_body
 
-    table_resp = client.get(f"/{test_user.username}/{ten_rows.table_name}.json")
+    table_resp = client.get(table_json_url)
     assert (
         datetime.fromisoformat(table_resp.json["last_changed"]) > ten_rows.last_changed
     )
 
 
-def test_update__missing_row_id(client, ten_rows, test_user, post_content_type):
+def test_update__missing_row_id(
+    client, ten_rows, test_user, post_content_type, row_url
+):
     """Callers must include the row id for updates, and at the moment, it must match."""
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/1"
+    url = row_url(1)
     json_body = {
         "row": {
             "roman_numeral": "i",
@@ -444,9 +456,11 @@ def test_update__missing_row_id(client, ten_rows, test_user, post_content_type):
     assert resp.status_code == 400
 
 
-def test_update__missing_column(client, ten_rows, test_user, post_content_type):
+def test_update__missing_column(
+    client, ten_rows, test_user, post_content_type, row_url, table_json_url
+):
     """Check that missing columns are allowed, but come through as None/NULL"""
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/1"
+    url = row_url(1)
     json_body = {
         "row_id": 1,
         "row": {
@@ -489,14 +503,14 @@ def test_update__missing_column(client, ten_rows, test_user, post_content_type):
     resp = client.get(url)
     assert resp.json == expected
 
-    table_resp = client.get(f"/{test_user.username}/{ten_rows.table_name}.json")
+    table_resp = client.get(table_json_url)
     assert (
         datetime.fromisoformat(table_resp.json["last_changed"]) > ten_rows.last_changed
     )
 
 
-def test_update__extra_column(client, ten_rows, test_user, post_content_type):
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/1"
+def test_update__extra_column(client, ten_rows, test_user, post_content_type, row_url):
+    url = row_url(1)
     json_body = {
         "row_id": 1,
         "row": {
@@ -525,12 +539,12 @@ def test_update__extra_column(client, ten_rows, test_user, post_content_type):
     assert resp.status_code == 400, resp.data
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_update__etag_matches(client, test_user, ten_rows):
     assert False
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_update__etag_doesnt_match(client, test_user, ten_rows):
     resp = client.put(  # noqa: F841
         f"/{test_user.username}/{ten_rows.table_name}",
@@ -548,8 +562,8 @@ def test_update__etag_doesnt_match(client, test_user, ten_rows):
     )
 
 
-def test_update__row_does_not_exist(client, ten_rows, test_user):
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/11"
+def test_update__row_does_not_exist(client, ten_rows, test_user, row_url):
+    url = row_url(11)
     new = {
         "row_id": 11,
         "row": {
@@ -564,32 +578,32 @@ def test_update__row_does_not_exist(client, ten_rows, test_user):
     assert resp.json == {"error": "that row does not exist"}
 
 
-@pytest.mark.xfail(reason="test (and functionality!) not implemented")
+@pytest.mark.xfail(reason="test (and functionality!) not implemented", run=False)
 def test_update__row_does_not_match():
     """Test that where the row columns are wrong you get some kind of 4xx error"""
     assert False
 
 
-def test_update__row_id_does_not_match(client, ten_rows, test_user):
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/10"
+def test_update__row_id_does_not_match(client, ten_rows, test_user, row_url):
+    url = row_url(10)
     new = {"row_id": 11, "row": {"roman_numeral": "X+1"}}
     resp = client.put(url, json=new, headers={"Authorization": test_user.basic_auth()})
     assert resp.status_code == 400, resp.data
     assert resp.json == {"error": "invalid request"}
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_update__table_does_not_exist(client, test_user):
     assert False
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_update__user_does_not_exist(client, test_user):
     assert False
 
 
-def test_update__is_public_not_authed(client, ten_rows, test_user):
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/1"
+def test_update__is_public_not_authed(client, ten_rows, test_user, row_url):
+    url = row_url(1)
     new = {
         "row_id": 1,
         "row": {
@@ -620,15 +634,14 @@ def test_update__is_private_not_authed(client, private_table, test_user):
     assert resp.status_code == 404, resp.data
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_update__is_private_am_authed(client, private_table, test_user):
     assert False
 
 
 @pytest.mark.parametrize("is_public", [True, False])
-def test_update__as_another_user(client, is_public, test_user, crypt_context, sesh):
+def test_update__as_another_user(client, is_public, test_user, sesh, other_user):
     table = create_table(sesh, test_user, is_public=is_public)
-    other_user = make_user(sesh, crypt_context)
     sesh.commit()
 
     new = {"row_id": 1, "row": {"a": 2}}
@@ -658,7 +671,9 @@ def delete_mode(request):
 
 
 @pytest.mark.parametrize("is_public", [True, False])
-def test_delete__am_authed(client, ten_rows, test_user, is_public, delete_mode):
+def test_delete__am_authed(
+    client, ten_rows, test_user, is_public, delete_mode, table_json_url
+):
     url_template, verb = delete_mode
     url = url_template.format(
         username=test_user.username, table_name=ten_rows.table_name, row_id=1
@@ -677,7 +692,7 @@ def test_delete__am_authed(client, ten_rows, test_user, is_public, delete_mode):
             assert resp.status_code == 404, resp.data
             assert resp.json == {"error": "that row does not exist"}
 
-        table_resp = client.get(f"/{test_user.username}/{ten_rows.table_name}.json")
+        table_resp = client.get(table_json_url)
         assert (
             datetime.fromisoformat(table_resp.json["last_changed"])
             > ten_rows.last_changed
@@ -732,23 +747,23 @@ def test_delete__wrong_user(sesh, client, test_user, is_public, delete_mode):
         assert resp.json == {"error": "that table does not exist"}
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_delete__row_does_not_exist(client, ten_rows, test_user):
     assert False
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_delete__table_does_not_exist(client, test_user):
     assert False
 
 
-@pytest.mark.xfail(reason="test not implemented")
+@pytest.mark.xfail(reason="test not implemented", run=False)
 def test_delete__user_does_not_exist(client, test_user):
     assert False
 
 
-def test_delete__html_row_delete_check(client, ten_rows, test_user):
-    url = f"/{test_user.username}/{ten_rows.table_name}/rows/1/delete-check"
+def test_delete__html_row_delete_check(client, ten_rows, test_user, row_url):
+    url = row_url(1) + "/delete-check"
     with current_user(test_user):
         resp = client.get(url)
     assert resp.status_code == 200
@@ -636,7 +636,7 @@ XI,no,2018-01-11,11.0
     assert resp.status_code == 200
 
 
-@pytest.mark.xfail(reason="not implemented")
+@pytest.mark.xfail(reason="not implemented", run=False)
 def test_overwrite__wrong_content_type(client, test_user, ten_rows):
     assert False
 
@@ -62,9 +62,14 @@ def random_df() -> pd.DataFrame:
 
 
 def random_uuid() -> UUID:
+    # NOTE: these must really be random - test data accumulates in the test
+    # database across runs, so anything deterministic (eg a counter) would
+    # collide with rows from previous runs
     return uuid4()
 
 
+# NOTE: plain synchronous inserts - the test database is on a local socket so
+# there is no round-trip latency worth parallelising away
 def make_user(sesh: Session, crypt_context) -> ExtendedUser:
     username = "testuser-" + random_string()
     password = "password"
@@ -130,6 +135,8 @@ def random_stripe_url(host: str = "stripe.com", path_prefix="/") -> str:
     return f"https://{host}{path_prefix}/{random_string()}"
 
 
+# NOTE: these would be dataclass(slots=True) but that needs Python 3.10+ and
+# 3.8 is still supported
 @dataclass
 class FakeStripeSubscription:
     status: str = "active"